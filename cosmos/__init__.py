@@ -0,0 +1 @@
+import cosmos.options  # noqa: F401 registers the cosmos Meta options
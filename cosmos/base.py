@@ -57,9 +57,15 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self, autocommit, force_begin_transaction_with_broken_autocommit=False
     ):
         """
-        The base method actually causes a recursive loop, just set an internal flag
+        The base method actually causes a recursive loop, set the flag and run
+        the commit hooks directly.
         """
-        self._autocommit = autocommit
+        self.validate_no_atomic_block()
+        self.ensure_connection()
+        self._set_autocommit(autocommit)
+        if autocommit and self.run_commit_hooks_on_set_autocommit_on:
+            self.run_and_clear_commit_hooks()
+            self.run_commit_hooks_on_set_autocommit_on = False
 
     def get_connection_params(self):
         """Return a dict of parameters suitable for get_new_connection."""
@@ -94,3 +100,18 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
     def _savepoint_allowed(self):
         return False
+
+    def change_feed(self, model_or_table, **kwargs):
+        """
+        Return a ChangeFeed over the container of a model (yielding model
+        instances) or a table name (yielding raw rows).
+        """
+        self.ensure_connection()
+        if isinstance(model_or_table, str):
+            return self.connection.change_feed(model_or_table, **kwargs)
+        return self.connection.change_feed(
+            model_or_table._meta.db_table,
+            model=model_or_table,
+            using=self.alias,
+            **kwargs
+        )
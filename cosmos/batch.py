@@ -0,0 +1,103 @@
+import cosmos.errors as errors
+import azure.cosmos.exceptions as exceptions
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cosmos limit on the number of operations in one transactional batch
+MAX_OPERATIONS = 100
+
+
+class TransactionalBatch:
+    """
+    Writes buffered inside atomic(), committed as a single Cosmos
+    transactional batch. A batch can only target one container and one
+    partition key value.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._container = None
+        self._partition_key = None
+        self._operations = []
+
+    def add(self, container, partition_key, operation, args):
+        if self._container is None:
+            self._container = container
+            self._partition_key = partition_key
+        elif container.id != self._container.id:
+            raise errors.CosmosNotSupportedError(
+                "Transactions can only write to one container, "
+                "got {0} and {1}".format(self._container.id, container.id)
+            )
+        elif partition_key != self._partition_key:
+            raise errors.CosmosNotSupportedError(
+                "Transactions can only write to one partition key, "
+                "got {0} and {1}".format(self._partition_key, partition_key)
+            )
+        if len(self._operations) >= MAX_OPERATIONS:
+            raise errors.CosmosNotSupportedError(
+                "Transactions are limited to {0} writes".format(MAX_OPERATIONS)
+            )
+        self._operations.append((operation, args))
+
+    def commit(self, charges=None):
+        """
+        Execute the buffered writes, recording their request charge in
+        `charges`, and return the name of the container written.
+        """
+        if not self._operations:
+            return None
+        container, partition_key, operations = (
+            self._container,
+            self._partition_key,
+            self._operations,
+        )
+        self.clear()
+        logger.debug(
+            "Committing {0} writes to {1}".format(len(operations), container.id)
+        )
+        try:
+            container.execute_item_batch(
+                batch_operations=operations,
+                partition_key=partition_key,
+                response_hook=(
+                    None
+                    if charges is None
+                    else lambda headers, result: charges.record(container.id, headers)
+                ),
+            )
+        except (
+            exceptions.CosmosHttpResponseError,
+            exceptions.CosmosBatchOperationError,
+        ) as e:
+            raise errors.CosmosDatabaseError(
+                "Transaction on {0} failed".format(container.id)
+            ) from e
+        return container.id
+
+    def rollback(self):
+        self.clear()
+
+
+@contextmanager
+def atomic(using=None):
+    """
+    Buffer the creates, upserts and deletes made in the block and commit them
+    as one transactional batch on exit, or discard them if the block raises.
+    Django's own transaction.atomic() is left alone, it writes immediately.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    connection.ensure_connection()
+    connection.connection.begin_batch()
+    try:
+        yield
+    except BaseException:
+        connection.connection.end_batch(commit=False)
+        raise
+    connection.connection.end_batch()
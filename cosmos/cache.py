@@ -0,0 +1,151 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import sha1
+import json
+import threading
+import time
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def cache_key(container, *parts):
+    """Build a stable key for a container and a query."""
+    digest = sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"))
+    return "cosmos:{0}:{1}".format(container, digest.hexdigest())
+
+
+class QueryCache(ABC):
+    """
+    Result cache in front of Cosmos queries, keyed on the container, the
+    compiled SQL and its parameters. As with Django's CACHES, a timeout of
+    None keeps entries until they are invalidated and 0 disables caching.
+    """
+
+    def __init__(self, timeout=60, containers=None):
+        self.timeout = timeout
+        self.containers = set(containers) if containers is not None else None
+
+    def caches(self, container):
+        return self.containers is None or container in self.containers
+
+    @abstractmethod
+    def get(self, container, *parts):
+        pass
+
+    @abstractmethod
+    def set(self, container, value, *parts):
+        pass
+
+    @abstractmethod
+    def invalidate(self, container):
+        pass
+
+
+class MemoryQueryCache(QueryCache):
+    """In-process LRU cache with a TTL on each entry."""
+
+    def __init__(self, timeout=60, containers=None, max_entries=1000):
+        super().__init__(timeout, containers)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, container, *parts):
+        key = (container, cache_key(container, *parts))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, container, value, *parts):
+        if self.timeout is not None and self.timeout <= 0:
+            return
+        key = (container, cache_key(container, *parts))
+        expires = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, container):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == container]:
+                del self._entries[key]
+
+
+class DjangoQueryCache(QueryCache):
+    """
+    Cache backed by one of the Django CACHES. Eviction is left to the cache
+    backend, invalidation bumps a per-container generation that is part of
+    every key.
+    """
+
+    def __init__(self, timeout=60, containers=None, alias="default"):
+        super().__init__(timeout, containers)
+        self.alias = alias
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def _generation(self, container):
+        return self._cache.get_or_set(
+            "cosmos:generation:{0}".format(container), 0, timeout=None
+        )
+
+    def get(self, container, *parts):
+        return self._cache.get(
+            cache_key(container, self._generation(container), *parts)
+        )
+
+    def set(self, container, value, *parts):
+        self._cache.set(
+            cache_key(container, self._generation(container), *parts),
+            value,
+            timeout=self.timeout,
+        )
+
+    def invalidate(self, container):
+        key = "cosmos:generation:{0}".format(container)
+        try:
+            self._cache.incr(key)
+        except ValueError:
+            self._cache.set(key, 1, timeout=None)
+
+
+def get_query_cache(options, name):
+    """
+    Return the shared query cache for a database from its CACHE settings,
+    or None when result caching is disabled.
+    """
+    backend = options.get("BACKEND")
+    if not backend:
+        return None
+    with _caches_lock:
+        if name not in _caches:
+            if backend == "memory":
+                cache = MemoryQueryCache(
+                    timeout=options.get("TIMEOUT", 60),
+                    containers=options.get("CONTAINERS"),
+                    max_entries=options.get("MAX_ENTRIES", 1000),
+                )
+            elif backend == "django":
+                cache = DjangoQueryCache(
+                    timeout=options.get("TIMEOUT", 60),
+                    containers=options.get("CONTAINERS"),
+                    alias=options.get("ALIAS", "default"),
+                )
+            else:
+                raise ValueError("Unknown cache backend {0}".format(backend))
+            _caches[name] = cache
+        return _caches[name]
@@ -0,0 +1,169 @@
+from azure.cosmos.partition_key import PartitionKey
+import azure.cosmos.exceptions as exceptions
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def feed_range_key(feed_range):
+    if feed_range is None:
+        return "all"
+    return sha1(json.dumps(feed_range, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LocalCheckpointStore:
+    """
+    Keep continuation tokens in memory, optionally persisted to a JSON file
+    so a consumer can resume after a restart.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.persistent = bool(path)
+        self._tokens = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._tokens = json.load(f)
+
+    def get(self, lease_id):
+        with self._lock:
+            return self._tokens.get(lease_id)
+
+    def set(self, lease_id, continuation):
+        with self._lock:
+            self._tokens[lease_id] = continuation
+            if self.path:
+                # Write then rename, so a crash never leaves a truncated file
+                tmp_path = "{0}.tmp".format(self.path)
+                with open(tmp_path, "w") as f:
+                    json.dump(self._tokens, f)
+                os.replace(tmp_path, self.path)
+
+
+class ContainerCheckpointStore:
+    """Keep continuation tokens as documents in a Cosmos lease container."""
+
+    persistent = True
+
+    def __init__(self, db, container="cosmos_leases"):
+        self._container = db.create_container_if_not_exists(
+            id=container, partition_key=PartitionKey(path="/id", kind="Hash")
+        )
+
+    def get(self, lease_id):
+        try:
+            lease = self._container.read_item(lease_id, partition_key=lease_id)
+        except exceptions.CosmosResourceNotFoundError:
+            return None
+        return lease.get("continuation")
+
+    def set(self, lease_id, continuation):
+        self._container.upsert_item({"id": lease_id, "continuation": continuation})
+
+
+class ChangeFeed:
+    """
+    Incremental reader over a container's change feed. The continuation
+    token of each feed range is checkpointed once a page of changes has been
+    consumed, so delivery is at-least-once.
+
+    Without a checkpoint, reading starts from the beginning of the feed when
+    the checkpoints persist and from now otherwise, unless
+    `start_from_beginning` says so.
+    """
+
+    def __init__(
+        self,
+        container,
+        checkpoints,
+        name="default",
+        start_from_beginning=None,
+        max_item_count=None,
+        model=None,
+        using=None,
+    ):
+        self._container = container
+        self._checkpoints = checkpoints
+        self._name = name
+        if start_from_beginning is None:
+            start_from_beginning = getattr(checkpoints, "persistent", True)
+        self._start_from_beginning = start_from_beginning
+        self._max_item_count = max_item_count
+        self._model = model
+        self._using = using
+
+    def lease_id(self, feed_range=None):
+        return "{0}:{1}:{2}".format(
+            self._name, self._container.id, feed_range_key(feed_range)
+        )
+
+    def feed_ranges(self):
+        return list(self._container.read_feed_ranges())
+
+    def as_instance(self, row):
+        """Convert a raw change to a model instance when reading for a model."""
+        if self._model is None:
+            return row
+        fields = self._model._meta.concrete_fields
+        return self._model.from_db(
+            self._using,
+            [f.attname for f in fields],
+            [row.get(f.column) for f in fields],
+        )
+
+    def pages(self, feed_range=None):
+        """Yield pages of changes, checkpointing each one once the next is asked for."""
+        lease_id = self.lease_id(feed_range)
+        continuation = self._checkpoints.get(lease_id)
+        if continuation:
+            changes = self._container.query_items_change_feed(
+                continuation=continuation, max_item_count=self._max_item_count
+            )
+        else:
+            options = {
+                "start_time": "Beginning" if self._start_from_beginning else "Now",
+                "max_item_count": self._max_item_count,
+            }
+            if feed_range is not None:
+                options["feed_range"] = feed_range
+            changes = self._container.query_items_change_feed(**options)
+        pager = changes.by_page()
+        for page in pager:
+            rows = list(page)
+            if rows:
+                yield [self.as_instance(row) for row in rows]
+            if pager.continuation_token:
+                self._checkpoints.set(lease_id, pager.continuation_token)
+
+    def read(self, feed_range=None):
+        """Yield the changes since the last checkpoint, one at a time."""
+        for page in self.pages(feed_range):
+            for change in page:
+                yield change
+
+    def process(self, handler, max_workers=None):
+        """
+        Consume every feed range concurrently, calling `handler` with each
+        page of changes. Return the number of changes processed.
+        """
+        feed_ranges = self.feed_ranges()
+
+        def consume(feed_range):
+            count = 0
+            for page in self.pages(feed_range):
+                handler(page)
+                count += len(page)
+            logger.debug(
+                "Processed {0} changes from {1}".format(count, self.lease_id(feed_range))
+            )
+            return count
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(feed_ranges) or 1) as pool:
+            return sum(pool.map(consume, feed_ranges))
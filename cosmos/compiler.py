@@ -12,6 +12,29 @@ from django.db.models.sql.constants import (
 from django.core.exceptions import EmptyResultSet
 from django.db.models.sql.constants import INNER, LOUTER, ORDER_DIR, SINGLE
 from django.db.models.sql.datastructures import Join
+from django.db.models.sql.where import WhereNode
+from cosmos.options import document_ttl, ttl_field
+
+import json
+
+
+def partition_keys_as_strings(cursor, where):
+    """
+    Generated partition keys are stored as strings, convert integer lookups
+    on the partition key column, including IN lists, inside any nested or
+    negated condition.
+    """
+    for child in where.children:
+        if isinstance(child, WhereNode):
+            partition_keys_as_strings(cursor, child)
+            continue
+        target = getattr(getattr(child, "lhs", None), "target", None)
+        if target is None or not cursor.is_pk(target.column):
+            continue
+        if isinstance(child.rhs, int):
+            child.rhs = str(child.rhs)
+        elif isinstance(child.rhs, (list, tuple, set)):
+            child.rhs = [str(v) if isinstance(v, int) else v for v in child.rhs]
 
 
 class SQLCompiler(compiler.SQLCompiler):
@@ -103,6 +126,23 @@ class SQLCompiler(compiler.SQLCompiler):
         group_by = self.get_group_by(self.select + extra_select, order_by)
         return extra_select, order_by, group_by
 
+    def explain_query(self):
+        """
+        Cosmos has no EXPLAIN statement, run the query and report its request
+        charge and query and index metrics instead.
+        """
+        sql, params = self.as_sql()
+        cursor = self.connection.cursor()
+        cursor.set_container(self.query.get_meta().db_table)
+        try:
+            profile = cursor.profile(sql.strip(), params)
+        finally:
+            cursor.close()
+        if self.query.explain_format and self.query.explain_format.upper() == "JSON":
+            yield json.dumps(profile.as_dict(), indent=2, default=str)
+        else:
+            yield from profile.lines()
+
     def execute_sql(
         self, result_type=MULTI, chunked_fetch=False, chunk_size=GET_ITERATOR_CHUNK_SIZE
     ):
@@ -239,6 +279,12 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
             {field.column: row[i] for i, field in enumerate(fields)}
             for row in value_rows
         ]
+        expiry_field = ttl_field(opts)
+        if expiry_field is not None:
+            for row, obj in zip(rows, self.query.objs):
+                ttl = document_ttl(getattr(obj, expiry_field.attname))
+                if ttl is not None:
+                    row["ttl"] = ttl
         return rows
 
     def field_as_sql(self, field, val):
@@ -256,7 +302,19 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
 
 
 class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
-    pass
+    def execute_sql(self, result_type=MULTI):
+        """
+        Cosmos has no DELETE statement, look up the matching items and delete
+        them one by one. Return the cursor so the row count can be read.
+        """
+        cursor = self.connection.cursor()
+        table = self.query.base_table
+        partition_keys_as_strings(cursor, self.query.where)
+        where, params = self.compile(self.query.where)
+        cursor.delete_items(self.quote_name_unless_alias(table), where, params)
+        if result_type == CURSOR:
+            return cursor
+        cursor.close()
 
 
 class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
@@ -270,19 +328,22 @@ class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
         qn = self.quote_name_unless_alias
         table = self.query.base_table
 
-        # Convert partition key params into strings.
-        for col in self.query.where.children:
-            if cursor.is_pk(col.lhs.target.column):
-                if isinstance(col.rhs, int):
-                    col.rhs = str(col.rhs)
+        partition_keys_as_strings(cursor, self.query.where)
         # Get the items first
         where, params = self.compile(self.query.where)
         
         marked_updates = cursor.get_items(qn(table), where, params)
+        expiry_field = ttl_field(self.query.get_meta())
 
         for item in marked_updates:
             values, update_params = [], []
             for field, model, val in self.query.values:
+                if field == expiry_field and not hasattr(val, "resolve_expression"):
+                    ttl = document_ttl(val)
+                    if ttl is not None:
+                        item["ttl"] = ttl
+                    else:
+                        item.pop("ttl", None)
                 if hasattr(val, "resolve_expression"):
                     val = val.resolve_expression(
                         self.query, allow_joins=False, for_save=True
@@ -323,7 +384,7 @@ class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
                     item[qn(name)] = placeholder % sql
                     update_params.extend(params)
                 elif val is not None:
-                    item[qn(name)] = placeholder
+                    item[qn(name)] = val
                 else:
                     item[qn(name)] = None
             cursor.upsert_item(item)
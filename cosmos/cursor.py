@@ -1,4 +1,6 @@
 import cosmos.errors as errors
+from cosmos.instrumentation import REQUEST_CHARGE
+from cosmos.profiler import profile_query
 from azure.cosmos.partition_key import PartitionKey
 
 from uuid import uuid4
@@ -16,18 +18,55 @@ def as_result_set(result):
     return list(result.values())
 
 
+def as_cosmos_query(operation, parameters):
+    """
+    Cosmos doesn't support unnamed parameters. It requires a special list
+    of KVP dictionaries. Convert them here.
+    """
+    params = []
+    cleaned_sql = ""
+    arg_num = 0
+    cursor = 0
+    for arg in re.finditer("%s", operation):
+        cleaned_sql += operation[cursor : arg.start()] + "@arg{0}".format(arg_num)
+        cursor = arg.end()
+        params.append({"name": "@arg{0}".format(arg_num), "value": parameters[arg_num]})
+        arg_num += 1
+    cleaned_sql += operation[cursor:]
+    return cleaned_sql, params
+
+
 class CosmosDatabaseCursor:
-    def __init__(self, name, db, partition_key):
+    def __init__(
+        self,
+        name,
+        db,
+        partition_key,
+        cache=None,
+        cache_staleness=None,
+        parallel=None,
+        batch=None,
+        charges=None,
+    ):
         self._name = name
         self._db = db
         self._partition_key = partition_key
+        self._cache = cache
+        self._cache_staleness = cache_staleness
+        self._parallel = parallel
+        self._batch = batch
+        self._charges = charges
+        self._result = None
         if name:
             self.set_container(name)
         else:
             self._container = None
 
     def close(self):
-        pass  # no equivalent method
+        # Stops any parallel query still filling its buffer
+        close = getattr(self._result, "close", None)
+        if close is not None:
+            close()
 
     def get_table_list(self):
         return self._db.list_containers()
@@ -38,51 +77,146 @@ class CosmosDatabaseCursor:
     def is_pk(self, col_name):
         return col_name == self._partition_key
 
-    def get_items(self, table, where, params):
+    def _cache_options(self):
+        """Request options for the dedicated gateway integrated cache."""
+        if self._cache_staleness is None:
+            return {}
+        return {"max_integrated_cache_staleness_in_ms": self._cache_staleness}
+
+    def _uses_cache(self):
+        return self._cache is not None and self._cache.caches(self._container.id)
+
+    def _hook(self, container=None):
+        """
+        Response hook adding the charge of each response, or query page, to
+        the connection's totals.
+        """
+        if self._charges is None:
+            return None
+        charges, name = self._charges, (container or self._container).id
+        return lambda headers, result: charges.record(name, headers)
+
+    def invalidate(self, table=None):
+        if self._cache is not None:
+            self._cache.invalidate(table or self._container.id)
+
+    def get_keys(self, table, where, params):
+        """
+        Query the id and partition key of the items matching `where`,
+        bypassing any result cache.
+        """
         self.set_container(table)
-        sql = "SELECT {0}.{1} FROM {2}".format(
-            table, self._partition_key, table
+        columns = ["id"]
+        if self._partition_key != "id":
+            columns.append(self._partition_key)
+        sql = "SELECT {0} FROM {1}".format(
+            ", ".join("{0}.{1}".format(table, c) for c in columns), table
         )  # both quoted
         if where:
             sql += " WHERE " + where
-        self.execute(sql, params)
+        cleaned_sql, cosmos_params = as_cosmos_query(sql, params)
+        return list(
+            self._container.query_items(
+                query=cleaned_sql,
+                parameters=cosmos_params,
+                enable_cross_partition_query=True,
+                response_hook=self._hook(),
+            )
+        )
+
+    def get_items(self, table, where, params):
+        """Read the full items matching `where`, bypassing any result cache."""
         return [
             self._container.read_item(
-                r[self._partition_key], partition_key="/{0}".format(self._partition_key)
+                key["id"],
+                partition_key=key[self._partition_key],
+                response_hook=self._hook(),
             )
-            for r in self._result
+            for key in self.get_keys(table, where, params)
         ]
 
     def upsert_item(self, item):
-        print("UPDATE: ", item)
-        return self._container.upsert_item(item)
+        logger.debug("UPDATE: %s", item)
+        if self._batch is not None:
+            self._batch.add(
+                self._container, item[self._partition_key], "upsert", (item,)
+            )
+            return item
+        result = self._container.upsert_item(item, response_hook=self._hook())
+        self.invalidate()
+        return result
+
+    def delete_item(self, item):
+        if self._batch is not None:
+            self._batch.add(
+                self._container, item[self._partition_key], "delete", (item["id"],)
+            )
+            return
+        self._container.delete_item(
+            item["id"],
+            partition_key=item[self._partition_key],
+            response_hook=self._hook(),
+        )
+        self.invalidate()
+
+    def delete_items(self, table, where, params):
+        """Delete the items matching `where`, leave their keys as the result."""
+        keys = self.get_keys(table, where, params)
+        for key in keys:
+            self.delete_item(key)
+        self._result = iter(keys)
+        return len(keys)
+
+    def profile(self, operation, parameters):
+        """Run a query without cache or parallelism and return its QueryProfile."""
+        if self._container is None:
+            raise errors.CosmosInterfaceError("Cursor has no container")
+        cleaned_sql, params = as_cosmos_query(operation, parameters)
+        profile = profile_query(self._container, cleaned_sql, params, self._partition_key)
+        if self._charges is not None:
+            self._charges.record(
+                self._container.id, {REQUEST_CHARGE: profile.request_charge}
+            )
+        return profile
 
     def execute(self, operation, *parameters):
-        logger.debug(operation, *parameters)
         if self._container is None:
             raise errors.CosmosInterfaceError("Cursor has no container")
 
         assert len(parameters) == 1
-        # Cosmos doesn't support unnamed parameters. It requires a special list
-        # of KVP dictionaries. Convert them here.
-        params = []
-        cleaned_sql = ""
-        arg_num = 0
-        cursor = 0
-        for arg in re.finditer("%s", operation):
-            cleaned_sql += operation[cursor : arg.start()] + "@arg{0}".format(arg_num)
-            cursor = arg.end()
-            params.append(
-                {"name": "@arg{0}".format(arg_num), "value": parameters[0][arg_num]}
+        cleaned_sql, params = as_cosmos_query(operation, parameters[0])
+        logger.debug("SQL Query : %s %s", cleaned_sql, params)
+        if self._uses_cache():
+            rows = self._cache.get(self._container.id, cleaned_sql, params)
+            if rows is None:
+                rows = list(self._query_items(cleaned_sql, params))
+                self._cache.set(self._container.id, rows, cleaned_sql, params)
+            self._result = iter(rows)
+        else:
+            self._result = self._query_items(cleaned_sql, params)
+
+    def _query_items(self, sql, params):
+        if self._parallel is not None:
+            result = self._parallel.query_items(
+                self._container,
+                sql,
+                params,
+                self._partition_key,
+                response_hook=self._hook(),
+                **self._cache_options()
             )
-            arg_num += 1
-        cleaned_sql += operation[cursor:]
-        print("SQL Query : ", cleaned_sql, parameters)
-        self._result = self._container.query_items(
-            query=cleaned_sql,
+            if result is not None:
+                return result
+        options = self._cache_options()
+        if self._parallel is not None and self._parallel.max_item_count:
+            options["max_item_count"] = self._parallel.max_item_count
+        return self._container.query_items(
+            query=sql,
             parameters=params,
             enable_cross_partition_query=True,
             populate_query_metrics=True,
+            response_hook=self._hook(),
+            **options
         )
 
     @property
@@ -118,11 +252,20 @@ class CosmosDatabaseCursor:
             row[self._partition_key] = str(self._last_id)
             if pk_col not in row:
                 row[pk_col] = self._last_id
-            self._db.create_container_if_not_exists(
+            container = self._db.create_container_if_not_exists(
                 id=table,
                 partition_key=PartitionKey(
                     path="/{0}".format(self._partition_key), kind="Hash"
                 ),
-            ).create_item(
-                body=row, request_options={"disableAutomaticIdGeneration": False}
             )
+            if self._batch is not None:
+                self._batch.add(
+                    container, row[self._partition_key], "create", (row,)
+                )
+                continue
+            container.create_item(
+                body=row,
+                request_options={"disableAutomaticIdGeneration": False},
+                response_hook=self._hook(container),
+            )
+        self.invalidate(table)
@@ -1,5 +1,11 @@
+from cosmos.batch import TransactionalBatch
+from cosmos.cache import get_query_cache
+from cosmos.changefeed import ChangeFeed, ContainerCheckpointStore, LocalCheckpointStore
 from cosmos.client import CosmosDatabaseClient
 from cosmos.cursor import CosmosDatabaseCursor
+from cosmos.instrumentation import RequestCharges
+from cosmos.parallel import ParallelQuery
+from cosmos.throughput import as_offer
 import cosmos.errors as errors
 import azure.cosmos.cosmos_client as cosmos_client
 import azure.cosmos.exceptions as exceptions
@@ -11,10 +17,40 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def no_throughput(name):
+    """
+    The SDK raises not found, or IndexError on an empty offer list in recent
+    releases, for a resource without provisioned throughput.
+    """
+    if name is None:
+        return errors.CosmosNotSupportedError(
+            "The database has no shared throughput, its containers provision their own"
+        )
+    return errors.CosmosNotSupportedError(
+        "{0} has no throughput of its own, it uses the database's shared "
+        "throughput".format(name)
+    )
+
+
 class CosmosDatabaseConnection:
-    def __init__(self, db_proxy, partition_key):
+    def __init__(
+        self,
+        db_proxy,
+        partition_key,
+        cache=None,
+        cache_staleness=None,
+        change_feed_options=None,
+        parallel=None,
+    ):
         self._db = db_proxy
         self._partition_key = partition_key
+        self._cache = cache
+        self._cache_staleness = cache_staleness
+        self._change_feed_options = change_feed_options or {}
+        self._parallel = parallel
+        self._batch = None
+        self._checkpoints = None
+        self.request_charges = RequestCharges()
 
     def close(self):
         pass  # no equivalent method
@@ -25,21 +61,91 @@ class CosmosDatabaseConnection:
     def rollback(self):
         pass
 
+    def begin_batch(self):
+        """Buffer writes into a transactional batch until end_batch()."""
+        if self._batch is not None:
+            raise errors.CosmosProgrammingError(
+                "A transactional batch is already open on this connection"
+            )
+        self._batch = TransactionalBatch()
+
+    def end_batch(self, commit=True):
+        """Execute the buffered writes, or discard them when not committing."""
+        batch, self._batch = self._batch, None
+        if batch is None or not commit:
+            return
+        container = batch.commit(self.request_charges)
+        if container and self._cache is not None:
+            self._cache.invalidate(container)
+
     def cursor(self, name=None):
-        return CosmosDatabaseCursor(name, self._db, self._partition_key)
+        return CosmosDatabaseCursor(
+            name,
+            self._db,
+            self._partition_key,
+            cache=self._cache,
+            cache_staleness=self._cache_staleness,
+            parallel=self._parallel,
+            batch=self._batch,
+            charges=self.request_charges,
+        )
 
     def drop_container(self, name):
         try:
             self._db.delete_container(name)
         except exceptions.CosmosResourceNotFoundError:
             pass  # already deleted
+        if self._cache is not None:
+            self._cache.invalidate(name)
+
+    def checkpoint_store(self):
+        """The checkpoint store configured in the CHANGE_FEED settings."""
+        if self._checkpoints is None:
+            if "LEASE_CONTAINER" in self._change_feed_options:
+                self._checkpoints = ContainerCheckpointStore(
+                    self._db, self._change_feed_options["LEASE_CONTAINER"]
+                )
+            else:
+                self._checkpoints = LocalCheckpointStore(
+                    self._change_feed_options.get("CHECKPOINT_FILE")
+                )
+        return self._checkpoints
+
+    def change_feed(self, table, checkpoints=None, **kwargs):
+        return ChangeFeed(
+            self._db.get_container_client(table),
+            checkpoints or self.checkpoint_store(),
+            **kwargs
+        )
 
-    def create_container(self, name):
+    def _offer_owner(self, name):
+        return self._db if name is None else self._db.get_container_client(name)
+
+    def get_throughput(self, name=None):
+        """Provisioned throughput of a container, or of the database."""
+        try:
+            return self._offer_owner(name).get_throughput()
+        except (exceptions.CosmosResourceNotFoundError, IndexError) as e:
+            raise no_throughput(name) from e
+
+    def replace_throughput(self, name, throughput):
+        try:
+            return self._offer_owner(name).replace_throughput(throughput)
+        except (exceptions.CosmosResourceNotFoundError, IndexError) as e:
+            raise no_throughput(name) from e
+
+    def create_container(self, name, default_ttl=None, offer_throughput=None):
+        options = {}
+        if default_ttl is not None:
+            options["default_ttl"] = default_ttl
+        if offer_throughput is not None:
+            options["offer_throughput"] = offer_throughput
         self._db.create_container_if_not_exists(
             id=name,
             partition_key=PartitionKey(
                 path="/{0}".format(self._partition_key), kind="Hash"
             ),
+            **options
         )
 
 
@@ -74,11 +180,35 @@ class CosmosDatabase:
         logger.debug("Connecting to {0} for database {1}.".format(url, database))
         client = cosmos_client.CosmosClient(url, key, proxy_config=proxy)
         try:
-            db_proxy = client.create_database_if_not_exists(database)
+            db_proxy = client.create_database_if_not_exists(
+                database,
+                offer_throughput=as_offer(
+                    kwargs.get("THROUGHPUT"), kwargs.get("AUTOSCALE_MAX_THROUGHPUT")
+                ),
+            )
             if "PARTITION_KEY" not in kwargs:
                 partition_key = "id"
             else:
                 partition_key = kwargs["PARTITION_KEY"]
-            return CosmosDatabaseConnection(db_proxy, partition_key)
+            cache_options = kwargs.get("CACHE", {})
+            if "PARALLEL_QUERY" in kwargs:
+                parallel_options = kwargs["PARALLEL_QUERY"]
+                parallel = ParallelQuery(
+                    max_degree=parallel_options.get("MAX_DEGREE_OF_PARALLELISM", 4),
+                    max_buffered_item_count=parallel_options.get(
+                        "MAX_BUFFERED_ITEM_COUNT", 1000
+                    ),
+                    max_item_count=parallel_options.get("MAX_ITEM_COUNT"),
+                )
+            else:
+                parallel = None
+            return CosmosDatabaseConnection(
+                db_proxy,
+                partition_key,
+                cache=get_query_cache(cache_options, (url, database)),
+                cache_staleness=cache_options.get("INTEGRATED_CACHE_STALENESS"),
+                change_feed_options=kwargs.get("CHANGE_FEED"),
+                parallel=parallel,
+            )
         except exceptions.CosmosHttpResponseError as e:
             raise errors.CosmosInternalError from e
@@ -2,4 +2,5 @@ from django.db.backends.base.features import BaseDatabaseFeatures
 
 
 class CosmosDatabaseFeatures(BaseDatabaseFeatures):
-    pass
+    supports_explaining_query_execution = True
+    supported_explain_formats = {"JSON", "TEXT"}
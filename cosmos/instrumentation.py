@@ -0,0 +1,37 @@
+from collections import defaultdict
+import threading
+
+REQUEST_CHARGE = "x-ms-request-charge"
+
+
+class RequestCharges:
+    """Request units consumed per container, read from the response headers."""
+
+    def __init__(self):
+        self._totals = defaultdict(float)
+        self._requests = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, container, headers):
+        charge = float((headers or {}).get(REQUEST_CHARGE, 0))
+        with self._lock:
+            self._totals[container] += charge
+            self._requests[container] += 1
+        return charge
+
+    def total(self, container=None):
+        with self._lock:
+            if container is None:
+                return sum(self._totals.values())
+            return self._totals[container]
+
+    def requests(self, container=None):
+        with self._lock:
+            if container is None:
+                return sum(self._requests.values())
+            return self._requests[container]
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self._requests.clear()
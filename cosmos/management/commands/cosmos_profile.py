@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a query against a Cosmos container and report the SQL sent, its "
+        "request charge, query and index metrics, and what makes it expensive."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Model to query, as app_label.ModelName.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="LOOKUP=VALUE",
+            help="Queryset filter, e.g. --filter price__gt=10. Can be repeated.",
+        )
+        parser.add_argument(
+            "--exclude", action="append", default=[], metavar="LOOKUP=VALUE"
+        )
+        parser.add_argument("--format", choices=["text", "json"], default="text")
+
+    def lookups(self, pairs):
+        lookups = {}
+        for pair in pairs:
+            if "=" not in pair:
+                raise CommandError("Expected LOOKUP=VALUE, got {0}".format(pair))
+            key, value = pair.split("=", 1)
+            lookups[key] = value
+        return lookups
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        connection = connections[options["database"]]
+        if connection.vendor != "cosmos":
+            raise CommandError("{0} is not a Cosmos database".format(connection.alias))
+        queryset = (
+            model._default_manager.using(connection.alias)
+            .filter(**self.lookups(options["filter"]))
+            .exclude(**self.lookups(options["exclude"]))
+        )
+        self.stdout.write(queryset.explain(format=options["format"]))
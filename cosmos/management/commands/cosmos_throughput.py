@@ -0,0 +1,70 @@
+from cosmos.errors import CosmosNotSupportedError
+from cosmos.throughput import ScaledThroughput, as_offer, describe
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+import shlex
+
+
+class Command(BaseCommand):
+    help = (
+        "Show or change the provisioned throughput of a Cosmos container, or "
+        "raise it only while another management command runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "table", nargs="?", help="Container name, the database when omitted."
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--throughput", type=int, help="Manual RU/s.")
+        group.add_argument(
+            "--autoscale-max", type=int, help="Autoscale maximum RU/s."
+        )
+        parser.add_argument(
+            "--run",
+            help='Command to run with the raised throughput, e.g. "loaddata data.json".',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.scale(options)
+        except CosmosNotSupportedError as e:
+            raise CommandError(str(e)) from e
+
+    def scale(self, options):
+        connection = connections[options["database"]]
+        if connection.vendor != "cosmos":
+            raise CommandError("{0} is not a Cosmos database".format(connection.alias))
+        connection.ensure_connection()
+        table = options["table"]
+        offer = as_offer(options["throughput"], options["autoscale_max"])
+
+        if options["run"]:
+            if table is None or offer is None:
+                raise CommandError("--run needs a table and a throughput to scale to")
+            with ScaledThroughput(
+                table,
+                throughput=options["throughput"],
+                autoscale_max_throughput=options["autoscale_max"],
+                using=connection.alias,
+            ) as scaled:
+                call_command(*shlex.split(options["run"]))
+            self.stdout.write(
+                "{0} restored to {1}, {2:.2f} RU consumed in {3:.1f}s".format(
+                    table,
+                    describe(scaled.previous),
+                    scaled.request_charge,
+                    scaled.elapsed,
+                )
+            )
+            return
+
+        if offer is not None:
+            connection.connection.replace_throughput(table, offer)
+        current = connection.connection.get_throughput(table)
+        self.stdout.write(
+            "{0}: {1}".format(table or connection.settings_dict["NAME"], describe(current))
+        )
@@ -4,6 +4,7 @@ import azure.cosmos
 
 class CosmosDatabaseOperations(BaseDatabaseOperations):
     compiler_module = "cosmos.compiler"
+    explain_prefix = ""  # the compiler profiles the query instead
 
     def quote_name(self, name: str):
         return name
@@ -0,0 +1,63 @@
+from cosmos.throughput import as_offer
+from django.db.models import options
+from django.utils import timezone
+
+from datetime import datetime, timedelta
+
+# Extra model Meta options understood by the Cosmos backend
+COSMOS_OPTIONS = (
+    "cosmos_default_ttl",
+    "cosmos_ttl_field",
+    "cosmos_throughput",
+    "cosmos_autoscale_max_throughput",
+)
+
+options.DEFAULT_NAMES = options.DEFAULT_NAMES + tuple(
+    name for name in COSMOS_OPTIONS if name not in options.DEFAULT_NAMES
+)
+
+
+def default_ttl(opts):
+    """
+    Container default TTL in seconds, -1 to only expire documents that carry
+    their own TTL, or None to disable expiry. Cosmos ignores per-document TTLs
+    while expiry is disabled, so a model with a TTL field defaults to -1.
+    """
+    ttl = getattr(opts, "cosmos_default_ttl", None)
+    if ttl is None and getattr(opts, "cosmos_ttl_field", None) is not None:
+        return -1
+    return ttl
+
+
+def throughput(opts):
+    """Manual RU/s or autoscale maximum to provision the container with."""
+    return as_offer(
+        getattr(opts, "cosmos_throughput", None),
+        getattr(opts, "cosmos_autoscale_max_throughput", None),
+    )
+
+
+def ttl_field(opts):
+    name = getattr(opts, "cosmos_ttl_field", None)
+    if name is None:
+        return None
+    return opts.get_field(name)
+
+
+def document_ttl(value):
+    """
+    Convert the value of a TTL field to a per-document TTL in seconds. The
+    value can be a number of seconds, -1 to never expire, a timedelta, or the
+    datetime at which the document expires. Anything already expired gets
+    the shortest TTL.
+    """
+    if value is None:
+        return None
+    if value == -1:
+        return -1
+    if isinstance(value, datetime):
+        now = timezone.now() if timezone.is_aware(value) else datetime.now()
+        value = value - now
+    if isinstance(value, timedelta):
+        value = value.total_seconds()
+    return max(int(value), 1)
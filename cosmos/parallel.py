@@ -0,0 +1,202 @@
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import queue
+import re
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+ORDER_BY = re.compile(r"\sORDER BY\s+(.+)$", re.IGNORECASE | re.DOTALL)
+SELECT = re.compile(r"^\s*SELECT\s+(.+?)\s+FROM\s", re.IGNORECASE | re.DOTALL)
+
+# Queries whose result can't be rebuilt by concatenating per-range results
+NOT_SPLITTABLE = re.compile(
+    r"\b(TOP|DISTINCT|GROUP BY|OFFSET|LIMIT)\b|\b(COUNT|SUM|AVG|MIN|MAX)\s*\(",
+    re.IGNORECASE,
+)
+
+_DONE = object()
+
+
+def targets_one_partition(sql, partition_key):
+    """True when the query filters on an equality of the partition key."""
+    return bool(
+        re.search(r"\.{0}\s*=\s*@arg\d+".format(re.escape(partition_key)), sql)
+    )
+
+
+def sort_key(value):
+    """
+    Order values like Cosmos does across types, null first, so rows missing
+    the ORDER BY column can be compared with the others.
+    """
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, str(value))
+
+
+def fetch_page(pages):
+    """Fetch the next page of a query as a list, or None when it is done."""
+    page = next(pages, None)
+    if page is None:
+        return None
+    return list(page)
+
+
+def order_by_keys(sql):
+    """
+    Return the result keys and direction of a trailing ORDER BY clause as
+    (keys, reverse), ([], False) when there is none, or None when the order
+    can't be reproduced client side (mixed directions).
+    """
+    match = ORDER_BY.search(sql)
+    if not match:
+        return [], False
+    keys, directions = [], set()
+    for term in match.group(1).split(","):
+        parts = term.split()
+        directions.add(len(parts) > 1 and parts[1].upper() == "DESC")
+        keys.append(parts[0].rsplit(".", 1)[-1])
+    if len(directions) > 1:
+        return None
+    return keys, directions.pop()
+
+
+def projects(sql, keys):
+    """True when every key is a column in the SELECT list of the query."""
+    match = SELECT.search(sql)
+    if match is None:
+        return False
+    columns = [c.strip() for c in match.group(1).split(",")]
+    if columns == ["*"]:
+        return True
+    names = {c.split()[-1].rsplit(".", 1)[-1] for c in columns}
+    return all(key in names for key in keys)
+
+
+class ParallelQuery:
+    """
+    Run a cross-partition query by feed range on a bounded thread pool and
+    merge the results, keeping ORDER BY order when the query has one.
+    """
+
+    def __init__(self, max_degree=4, max_buffered_item_count=1000, max_item_count=None):
+        self.max_degree = max_degree
+        self.max_buffered_item_count = max_buffered_item_count
+        self.max_item_count = max_item_count
+
+    def query_items(self, container, sql, params, partition_key, **options):
+        """
+        Return an iterator over the merged results, or None when the query
+        has to run serially.
+        """
+        if targets_one_partition(sql, partition_key) or NOT_SPLITTABLE.search(sql):
+            return None
+        order = order_by_keys(sql)
+        # The merge compares the ORDER BY columns of each row, so they must be
+        # in the results
+        if order is None or not projects(sql, order[0]):
+            return None
+        feed_ranges = list(container.read_feed_ranges())
+        if len(feed_ranges) < 2:
+            return None
+        logger.debug("Running query over {0} feed ranges".format(len(feed_ranges)))
+
+        # Keep the rows held for an ordered merge within the buffer size
+        max_item_count = self.max_item_count or max(
+            1, self.max_buffered_item_count // (2 * len(feed_ranges))
+        )
+
+        def query_range(feed_range):
+            return container.query_items(
+                query=sql,
+                parameters=params,
+                feed_range=feed_range,
+                max_item_count=max_item_count,
+                **options
+            )
+
+        keys, reverse = order
+        if keys:
+            return self._ordered(query_range, feed_ranges, keys, reverse)
+        return self._unordered(query_range, feed_ranges)
+
+    def _ordered(self, query_range, feed_ranges, keys, reverse):
+        """
+        Each range comes back sorted, so a k-way merge restores the order. A
+        range holds at most its current page and the next one, prefetched on
+        the pool while the current page is consumed.
+        """
+
+        def stream(pool, feed_range):
+            pages = query_range(feed_range).by_page()
+            future = pool.submit(fetch_page, pages)
+            while True:
+                page = future.result()
+                if page is None:
+                    return
+                future = pool.submit(fetch_page, pages)
+                for row in page:
+                    yield row
+
+        def merge():
+            pool = ThreadPoolExecutor(max_workers=self.max_degree)
+            try:
+                yield from heapq.merge(
+                    *[stream(pool, feed_range) for feed_range in feed_ranges],
+                    key=lambda row: [sort_key(row.get(k)) for k in keys],
+                    reverse=reverse,
+                )
+            finally:
+                pool.shutdown(wait=False)
+
+        return merge()
+
+    def _unordered(self, query_range, feed_ranges):
+        buffer = queue.Queue(maxsize=self.max_buffered_item_count)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(feed_range):
+            try:
+                for row in query_range(feed_range):
+                    if not put(row):
+                        return
+            except Exception as e:
+                put(e)
+            put(_DONE)
+
+        def consume():
+            pool = ThreadPoolExecutor(max_workers=self.max_degree)
+            for feed_range in feed_ranges:
+                pool.submit(produce, feed_range)
+            remaining = len(feed_ranges)
+            try:
+                while remaining:
+                    item = buffer.get()
+                    if item is _DONE:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
+                pool.shutdown(wait=False)
+
+        return consume()
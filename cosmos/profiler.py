@@ -0,0 +1,209 @@
+from cosmos.instrumentation import REQUEST_CHARGE
+from cosmos.parallel import targets_one_partition
+
+from base64 import b64decode
+import binascii
+import json
+
+QUERY_METRICS = "x-ms-documentdb-query-metrics"
+INDEX_METRICS = "x-ms-cosmos-index-utilization"
+
+# Warn when a query reads this many documents for each one it returns
+RETRIEVED_PER_OUTPUT = 10
+
+# Query metrics that add up across pages
+SUMMED_METRICS = (
+    "retrievedDocumentCount",
+    "retrievedDocumentSize",
+    "outputDocumentCount",
+    "outputDocumentSize",
+    "totalExecutionTimeInMs",
+    "queryCompileTimeInMs",
+    "indexLookupTimeInMs",
+    "documentLoadTimeInMs",
+)
+
+
+def parse_query_metrics(header):
+    """Parse the `key=value;key=value` query metrics header."""
+    metrics = {}
+    for pair in (header or "").split(";"):
+        if "=" not in pair:
+            continue
+        key, value = pair.split("=", 1)
+        try:
+            metrics[key.strip()] = float(value)
+        except ValueError:
+            continue
+    return metrics
+
+
+def parse_index_metrics(header):
+    """Parse the index utilization header, base64 encoded JSON."""
+    if not header:
+        return {}
+    try:
+        return json.loads(b64decode(header).decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    try:
+        return json.loads(header)
+    except ValueError:
+        return {}
+
+
+def index_paths(entries):
+    paths = []
+    for entry in entries or []:
+        if "IndexSpecs" in entry:
+            paths.append(", ".join(entry["IndexSpecs"]))
+        else:
+            paths.append(entry.get("IndexSpec", entry.get("FilterExpression", "?")))
+    return paths
+
+
+class QueryProfile:
+    """
+    The cost of running a query: request charge, query and index metrics
+    collected from every page, and warnings about what drives the cost.
+    """
+
+    def __init__(self, container, sql, parameters, partition_key):
+        self.container = container
+        self.sql = sql
+        self.parameters = parameters
+        self.partition_key = partition_key
+        self.request_charge = 0.0
+        self.requests = 0
+        self.pages = 0
+        self.rows = 0
+        self.metrics = dict.fromkeys(SUMMED_METRICS, 0.0)
+        self.index_utilization_ratio = None
+        self.utilized_indexes = []
+        self.potential_indexes = []
+        self.feed_ranges = None
+
+    @property
+    def cross_partition(self):
+        """True unless the query filters on an equality of the partition key."""
+        return not targets_one_partition(self.sql, self.partition_key)
+
+    def add_page(self, rows):
+        self.pages += 1
+        self.rows += rows
+
+    def add_response(self, headers):
+        """
+        Add the charge and metrics of one response. A page of a cross-partition
+        query can take several requests, one per partition visited.
+        """
+        self.requests += 1
+        self.request_charge += float(headers.get(REQUEST_CHARGE, 0))
+        metrics = parse_query_metrics(headers.get(QUERY_METRICS))
+        for key in SUMMED_METRICS:
+            self.metrics[key] += metrics.get(key, 0.0)
+        if "indexUtilizationRatio" in metrics:
+            ratio = metrics["indexUtilizationRatio"]
+            self.index_utilization_ratio = (
+                ratio
+                if self.index_utilization_ratio is None
+                else min(self.index_utilization_ratio, ratio)
+            )
+        indexes = parse_index_metrics(headers.get(INDEX_METRICS))
+        for utilized in ("UtilizedSingleIndexes", "UtilizedCompositeIndexes"):
+            for path in index_paths(indexes.get(utilized)):
+                if path not in self.utilized_indexes:
+                    self.utilized_indexes.append(path)
+        for potential in ("PotentialSingleIndexes", "PotentialCompositeIndexes"):
+            for path in index_paths(indexes.get(potential)):
+                if path not in self.potential_indexes:
+                    self.potential_indexes.append(path)
+
+    @property
+    def warnings(self):
+        warnings = []
+        if self.cross_partition:
+            warnings.append(
+                "Cross-partition query{0}, filter on /{1} to target one partition".format(
+                    " fans out over {0} feed ranges".format(self.feed_ranges)
+                    if self.feed_ranges and self.feed_ranges > 1
+                    else "",
+                    self.partition_key,
+                )
+            )
+        for path in self.potential_indexes:
+            warnings.append("Missing index: {0}".format(path))
+        retrieved = self.metrics["retrievedDocumentCount"]
+        output = self.metrics["outputDocumentCount"]
+        if retrieved > max(output, 1) * RETRIEVED_PER_OUTPUT:
+            warnings.append(
+                "Retrieved {0:.0f} documents to return {1:.0f}".format(retrieved, output)
+            )
+        return warnings
+
+    def as_dict(self):
+        return {
+            "container": self.container,
+            "sql": self.sql,
+            "parameters": self.parameters,
+            "request_charge": self.request_charge,
+            "requests": self.requests,
+            "pages": self.pages,
+            "rows": self.rows,
+            "metrics": self.metrics,
+            "index_utilization_ratio": self.index_utilization_ratio,
+            "utilized_indexes": self.utilized_indexes,
+            "potential_indexes": self.potential_indexes,
+            "cross_partition": self.cross_partition,
+            "feed_ranges": self.feed_ranges,
+            "warnings": self.warnings,
+        }
+
+    def lines(self):
+        lines = [
+            "Container: {0}".format(self.container),
+            "SQL: {0}".format(self.sql),
+        ]
+        for param in self.parameters:
+            lines.append("  {0} = {1!r}".format(param["name"], param["value"]))
+        lines += [
+            "Request charge: {0:.2f} RU over {1} requests, {2} pages".format(
+                self.request_charge, self.requests, self.pages
+            ),
+            "Documents: {0:.0f} retrieved, {1:.0f} output".format(
+                self.metrics["retrievedDocumentCount"],
+                self.metrics["outputDocumentCount"],
+            ),
+            "Index utilization ratio: {0}".format(
+                "n/a"
+                if self.index_utilization_ratio is None
+                else self.index_utilization_ratio
+            ),
+            "Time: {0:.2f} ms total, {1:.2f} ms index lookup, {2:.2f} ms document load".format(
+                self.metrics["totalExecutionTimeInMs"],
+                self.metrics["indexLookupTimeInMs"],
+                self.metrics["documentLoadTimeInMs"],
+            ),
+            "Utilized indexes: {0}".format(", ".join(self.utilized_indexes) or "none"),
+        ]
+        for warning in self.warnings:
+            lines.append("Warning: {0}".format(warning))
+        return lines
+
+
+def profile_query(container, sql, parameters, partition_key):
+    """Run a query, reading every page, and return its QueryProfile."""
+    profile = QueryProfile(container.id, sql, parameters, partition_key)
+    pages = container.query_items(
+        query=sql,
+        parameters=parameters,
+        enable_cross_partition_query=True,
+        populate_query_metrics=True,
+        populate_index_metrics=True,
+        response_hook=lambda headers, result: profile.add_response(headers),
+    ).by_page()
+    for page in pages:
+        profile.add_page(len(list(page)))
+    if profile.cross_partition:
+        profile.feed_ranges = len(list(container.read_feed_ranges()))
+    return profile
@@ -1,9 +1,14 @@
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from cosmos.options import default_ttl, throughput
 
 
 class CosmosDatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     def create_model(self, model):
-        self.connection.connection.create_container(model._meta.db_table)
+        self.connection.connection.create_container(
+            model._meta.db_table,
+            default_ttl=default_ttl(model._meta),
+            offer_throughput=throughput(model._meta),
+        )
 
         # Make M2M tables
         for field in model._meta.local_many_to_many:
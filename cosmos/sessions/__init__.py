@@ -0,0 +1 @@
+default_app_config = "cosmos.sessions.apps.CosmosSessionsConfig"
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class CosmosSessionsConfig(AppConfig):
+    name = "cosmos.sessions"
+    label = "cosmos_sessions"
+    verbose_name = "Cosmos Sessions"
@@ -0,0 +1,18 @@
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+
+class SessionStore(DBStore):
+    """
+    Database session store whose sessions are removed by the Cosmos TTL of
+    the cosmos_session container, so clearsessions has nothing to do.
+    """
+
+    @classmethod
+    def get_model_class(cls):
+        from cosmos.sessions.models import CosmosSession
+
+        return CosmosSession
+
+    @classmethod
+    def clear_expired(cls):
+        pass  # expired sessions are deleted by Cosmos
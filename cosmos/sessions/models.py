@@ -0,0 +1,12 @@
+from django.contrib.sessions.base_session import AbstractBaseSession
+
+
+class CosmosSession(AbstractBaseSession):
+    """Session expired server side by Cosmos from its expire_date."""
+
+    class Meta:
+        db_table = "cosmos_session"
+        verbose_name = "session"
+        verbose_name_plural = "sessions"
+        cosmos_default_ttl = -1
+        cosmos_ttl_field = "expire_date"
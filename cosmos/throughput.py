@@ -0,0 +1,90 @@
+from azure.cosmos import ThroughputProperties
+from django.db import DEFAULT_DB_ALIAS, connections
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def as_offer(throughput=None, autoscale_max_throughput=None):
+    """
+    The throughput to provision, autoscale when a maximum is given, manual
+    RU/s otherwise, or None to leave it to the account default.
+    """
+    if throughput and autoscale_max_throughput:
+        raise ValueError(
+            "Set either a manual throughput or an autoscale maximum, not both"
+        )
+    if autoscale_max_throughput:
+        return ThroughputProperties(auto_scale_max_throughput=autoscale_max_throughput)
+    return throughput
+
+
+def describe(properties):
+    if properties.auto_scale_max_throughput:
+        return "autoscale up to {0} RU/s".format(properties.auto_scale_max_throughput)
+    return "{0} RU/s".format(properties.offer_throughput)
+
+
+class ScaledThroughput:
+    """
+    Raise a container's throughput for the duration of a heavy job and put
+    it back afterwards, recording the request units the job consumed.
+    """
+
+    def __init__(
+        self,
+        table,
+        throughput=None,
+        autoscale_max_throughput=None,
+        using=DEFAULT_DB_ALIAS,
+    ):
+        self.table = table
+        self.offer = as_offer(throughput, autoscale_max_throughput)
+        self.using = using
+        self.previous = None
+        self.request_charge = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def _connection(self):
+        connection = connections[self.using]
+        connection.ensure_connection()
+        return connection.connection
+
+    def __enter__(self):
+        connection = self._connection
+        self.previous = connection.get_throughput(self.table)
+        connection.replace_throughput(self.table, self.offer)
+        logger.info(
+            "Scaled {0} from {1}".format(self.table, describe(self.previous))
+        )
+        self._start_charge = connection.request_charges.total(self.table)
+        self._start_time = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection = self._connection
+        self.elapsed = time.monotonic() - self._start_time
+        self.request_charge = (
+            connection.request_charges.total(self.table) - self._start_charge
+        )
+        connection.replace_throughput(
+            self.table,
+            as_offer(
+                self.previous.offer_throughput,
+                self.previous.auto_scale_max_throughput,
+            ),
+        )
+        logger.info(
+            "Restored {0} to {1}, {2:.2f} RU consumed in {3:.1f}s".format(
+                self.table, describe(self.previous), self.request_charge, self.elapsed
+            )
+        )
+
+
+def scaled_throughput(model_or_table, **kwargs):
+    if not isinstance(model_or_table, str):
+        model_or_table = model_or_table._meta.db_table
+    return ScaledThroughput(model_or_table, **kwargs)
@@ -24,7 +24,7 @@ setup(
     license='MIT',
     packages=find_packages(),
     install_requires=[
-        'azure-cosmos',
+        'azure-cosmos>=4.14.0',
     ],
     classifiers=CLASSIFIERS,
     keywords='django',
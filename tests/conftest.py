@@ -0,0 +1,42 @@
+import django
+from django.conf import settings
+import pytest
+
+
+def pytest_configure():
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "cosmos",
+                "URL": "https://localhost:8081/",
+                "KEY": "key",
+                "NAME": "test",
+            }
+        },
+        INSTALLED_APPS=["cosmos", "cosmos.sessions", "tests"],
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        SECRET_KEY="test",
+        SESSION_ENGINE="cosmos.sessions.backend",
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A fresh in-memory Cosmos database behind the default connection."""
+    import azure.cosmos.cosmos_client as cosmos_client
+    from cosmos.sessions.models import CosmosSession
+    from django.db import connection
+    from tests.fakes import FakeCosmosClient
+    from tests.models import Item
+
+    FakeCosmosClient.databases = {}
+    monkeypatch.setattr(cosmos_client, "CosmosClient", FakeCosmosClient)
+    connection.close()
+    connection.ensure_connection()
+    with connection.schema_editor() as editor:
+        editor.create_model(CosmosSession)
+        editor.create_model(Item)
+    yield FakeCosmosClient.databases["test"]
+    connection.close()
@@ -0,0 +1,331 @@
+"""
+In-memory stand-ins for the parts of the azure-cosmos SDK the backend uses.
+Queries support the SQL the compiler produces for simple filters:
+SELECT of columns, comparisons and IN combined with AND, OR and NOT,
+ORDER BY and OFFSET/LIMIT.
+"""
+from azure.cosmos import ThroughputProperties
+import azure.cosmos.exceptions as exceptions
+
+from copy import deepcopy
+import json
+import re
+
+CHARGE = 2.0
+
+QUERY = re.compile(
+    r"^SELECT (?P<columns>.+?) FROM (?P<table>\w+)"
+    r"(?: WHERE (?P<where>.+?))?"
+    r"(?: ORDER BY (?P<order>.+?))?"
+    r"(?: OFFSET (?P<offset>\d+) LIMIT (?P<limit>\d+))?$",
+    re.DOTALL,
+)
+# Turns a WHERE clause into a Python expression over `item` and `values`
+IN_LIST = re.compile(r"\s+IN\s*\(([^)]*)\)")
+TOKEN = re.compile(r"\w+\.\w+|@arg\d+|\b(?:AND|OR|NOT)\b|(?<![<>!=])=(?!=)")
+
+
+def translate(token):
+    if token in ("AND", "OR", "NOT"):
+        return token.lower()
+    if token == "=":
+        return "=="
+    if token.startswith("@"):
+        return 'values["{0}"]'.format(token)
+    return 'item.get("{0}")'.format(token.rsplit(".", 1)[-1])
+
+
+def not_found():
+    return exceptions.CosmosResourceNotFoundError(message="Not found")
+
+
+def as_properties(offer):
+    if isinstance(offer, ThroughputProperties):
+        return offer
+    return ThroughputProperties(offer_throughput=offer)
+
+
+class FakeOffer:
+    """Provisioned throughput of a database or container, None when it has none."""
+
+    throughput = None
+
+    def get_throughput(self, **kwargs):
+        if self.throughput is None:
+            raise not_found()
+        return self.throughput
+
+    def replace_throughput(self, throughput, **kwargs):
+        if self.throughput is None:
+            raise not_found()
+        self.throughput = as_properties(throughput)
+        return self.throughput
+
+
+class FakePaged:
+    """
+    Mimics ItemPaged: an iterator with by_page(), calling the response hook
+    for each request. A page can take several requests, as when a
+    cross-partition query visits each partition.
+    """
+
+    def __init__(
+        self, rows, page_size=None, response_hook=None, headers=None, requests=1
+    ):
+        self.rows = rows
+        self.requests = requests
+        self.headers = dict(headers or {}, **{"x-ms-request-charge": str(CHARGE)})
+        self.page_size = page_size or max(len(rows), 1)
+        self.response_hook = response_hook
+        self.fetched = 0
+        self._rows = None
+
+    def by_page(self):
+        for start in range(0, max(len(self.rows), 1), self.page_size):
+            page = self.rows[start : start + self.page_size]
+            self.fetched += 1
+            if self.response_hook is not None:
+                for _ in range(self.requests):
+                    self.response_hook(dict(self.headers), page)
+            yield iter(page)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._rows is None:
+            self._rows = (row for page in self.by_page() for row in page)
+        return next(self._rows)
+
+
+class FakeFeedPages:
+    """Mimics the change feed's page iterator and its continuation token."""
+
+    def __init__(self, pages):
+        self._pages = iter(pages)
+        self.continuation_token = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        page, self.continuation_token = next(self._pages)
+        return iter(page)
+
+
+class FakeChangeFeed:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def by_page(self):
+        return FakeFeedPages(self.pages)
+
+
+class FakeContainer(FakeOffer):
+    def __init__(self, id, partition_key="id", feed_range_count=1, default_ttl=None):
+        self.id = id
+        self.partition_key = partition_key
+        self.feed_range_count = feed_range_count
+        self.default_ttl = default_ttl
+        self.items = {}
+        self.queries = []
+        self.batches = []
+        self.response_headers = {}
+        self.requests_per_page = 1
+        # Latest version of each changed item with its sequence number
+        self.changes = {}
+        self.lsn = 0
+
+    def _hook(self, kwargs, result):
+        if kwargs.get("response_hook") is not None:
+            kwargs["response_hook"]({"x-ms-request-charge": str(CHARGE)}, result)
+
+    def _changed(self, item):
+        self.lsn += 1
+        self.changes[item["id"]] = (self.lsn, deepcopy(item))
+
+    def feed_range_of(self, item):
+        return hash(str(item[self.partition_key])) % self.feed_range_count
+
+    def read_feed_ranges(self):
+        return [{"index": i} for i in range(self.feed_range_count)]
+
+    def create_item(self, body, **kwargs):
+        if body["id"] in self.items:
+            raise exceptions.CosmosResourceExistsError(message="Conflict")
+        self.items[body["id"]] = deepcopy(body)
+        self._changed(body)
+        self._hook(kwargs, body)
+        return body
+
+    def upsert_item(self, body, **kwargs):
+        self.items[body["id"]] = deepcopy(body)
+        self._changed(body)
+        self._hook(kwargs, body)
+        return body
+
+    def read_item(self, item, partition_key, **kwargs):
+        if item not in self.items:
+            raise not_found()
+        found = self.items[item]
+        if found[self.partition_key] != partition_key:
+            raise not_found()
+        self._hook(kwargs, found)
+        return deepcopy(found)
+
+    def delete_item(self, item, partition_key, **kwargs):
+        if item not in self.items or self.items[item][self.partition_key] != partition_key:
+            raise not_found()
+        del self.items[item]
+        self._hook(kwargs, None)
+
+    def execute_item_batch(self, batch_operations, partition_key, **kwargs):
+        self.batches.append((list(batch_operations), partition_key))
+        items = deepcopy(self.items)
+        for operation, args in batch_operations:
+            if operation == "create":
+                if args[0]["id"] in items:
+                    raise exceptions.CosmosBatchOperationError(
+                        error_index=0, headers={}, status_code=409, message="Conflict"
+                    )
+                items[args[0]["id"]] = deepcopy(args[0])
+            elif operation == "upsert":
+                items[args[0]["id"]] = deepcopy(args[0])
+            elif operation == "delete":
+                items.pop(args[0], None)
+        for operation, args in batch_operations:
+            if operation in ("create", "upsert"):
+                self._changed(args[0])
+        self.items = items
+        self._hook(kwargs, [])
+        return []
+
+    def query_items(
+        self,
+        query,
+        parameters=None,
+        feed_range=None,
+        max_item_count=None,
+        response_hook=None,
+        **kwargs
+    ):
+        self.queries.append((query, parameters, feed_range, max_item_count))
+        rows = self.evaluate(query, parameters or [], feed_range)
+        return FakePaged(
+            rows,
+            max_item_count,
+            response_hook,
+            self.response_headers,
+            self.requests_per_page,
+        )
+
+    def query_items_change_feed(
+        self,
+        continuation=None,
+        feed_range=None,
+        start_time="Now",
+        max_item_count=None,
+        **kwargs
+    ):
+        if continuation is not None:
+            state = json.loads(continuation)
+            index, lsn = state["range"], state["lsn"]
+        else:
+            index = None if feed_range is None else feed_range["index"]
+            lsn = 0 if start_time == "Beginning" else self.lsn
+        changes = sorted(
+            change
+            for change in self.changes.values()
+            if change[0] > lsn
+            and (index is None or self.feed_range_of(change[1]) == index)
+        )
+        size = max_item_count or max(len(changes), 1)
+        pages = []
+        for start in range(0, max(len(changes), 1), size):
+            page = changes[start : start + size]
+            if page:
+                lsn = page[-1][0]
+            pages.append(
+                (
+                    [deepcopy(item) for _, item in page],
+                    json.dumps({"range": index, "lsn": lsn}),
+                )
+            )
+        return FakeChangeFeed(pages)
+
+    def evaluate(self, query, parameters, feed_range=None):
+        match = QUERY.match(query.strip())
+        if match is None:
+            raise ValueError("Unsupported query {0}".format(query))
+        values = {p["name"]: p["value"] for p in parameters}
+        items = list(self.items.values())
+        if feed_range is not None:
+            items = [i for i in items if self.feed_range_of(i) == feed_range["index"]]
+        if match.group("where"):
+            items = [i for i in items if self.matches(i, match.group("where"), values)]
+        if match.group("order"):
+            for term in reversed(match.group("order").split(",")):
+                parts = term.split()
+                column = parts[0].rsplit(".", 1)[-1]
+                items.sort(
+                    key=lambda i: (i.get(column) is not None, i.get(column) or 0),
+                    reverse=len(parts) > 1 and parts[1].upper() == "DESC",
+                )
+        if match.group("limit"):
+            offset = int(match.group("offset"))
+            items = items[offset : offset + int(match.group("limit"))]
+        columns = [c.strip().rsplit(".", 1)[-1] for c in match.group("columns").split(",")]
+        if columns == ["*"]:
+            return [deepcopy(i) for i in items]
+        return [{c: i.get(c) for c in columns} for i in items]
+
+    def matches(self, item, where, values):
+        expression = IN_LIST.sub(r" in [\1]", where)
+        expression = TOKEN.sub(lambda m: translate(m.group(0)), expression)
+        return bool(eval(expression, {}, {"item": item, "values": values}))
+
+
+class FakeDatabase(FakeOffer):
+    def __init__(self, id="django", feed_range_count=1):
+        self.id = id
+        self.feed_range_count = feed_range_count
+        self.containers = {}
+
+    def create_container_if_not_exists(self, id, partition_key, **kwargs):
+        if id not in self.containers:
+            self.containers[id] = FakeContainer(
+                id,
+                partition_key.path.lstrip("/"),
+                self.feed_range_count,
+                kwargs.get("default_ttl"),
+            )
+            if kwargs.get("offer_throughput") is not None:
+                self.containers[id].throughput = as_properties(kwargs["offer_throughput"])
+        return self.containers[id]
+
+    def get_container_client(self, id):
+        if id not in self.containers:
+            self.containers[id] = FakeContainer(id, feed_range_count=self.feed_range_count)
+        return self.containers[id]
+
+    def delete_container(self, id):
+        if id not in self.containers:
+            raise not_found()
+        del self.containers[id]
+
+    def list_containers(self):
+        return [{"id": name} for name in self.containers]
+
+
+class FakeCosmosClient:
+    databases = {}
+
+    def __init__(self, url, key, **kwargs):
+        self.url = url
+
+    def create_database_if_not_exists(self, id, **kwargs):
+        if id not in self.databases:
+            self.databases[id] = FakeDatabase(id)
+            if kwargs.get("offer_throughput") is not None:
+                self.databases[id].throughput = as_properties(kwargs["offer_throughput"])
+        return self.databases[id]
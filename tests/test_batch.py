@@ -0,0 +1,126 @@
+from cosmos import batch
+from cosmos.errors import CosmosDatabaseError, CosmosNotSupportedError
+from cosmos.sessions.models import CosmosSession
+from django.db import transaction
+from django.utils import timezone
+from tests.fakes import FakeContainer
+
+from datetime import timedelta
+
+import pytest
+
+
+def new_session(key):
+    return CosmosSession(
+        session_key=key,
+        session_data="data",
+        expire_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def sessions(db):
+    return db.containers["cosmos_session"]
+
+
+def test_batch_buffers_until_commit():
+    container = FakeContainer("app_item")
+    transactional = batch.TransactionalBatch()
+    transactional.add(container, "1", "create", ({"id": "1"},))
+    transactional.add(container, "1", "upsert", ({"id": "1", "a": 1},))
+    assert container.items == {}
+    assert transactional.commit() == "app_item"
+    assert container.items == {"1": {"id": "1", "a": 1}}
+    assert container.batches == [
+        ([("create", ({"id": "1"},)), ("upsert", ({"id": "1", "a": 1},))], "1")
+    ]
+    assert transactional.commit() is None
+
+
+def test_batch_rejects_second_partition_and_container():
+    container = FakeContainer("app_item")
+    transactional = batch.TransactionalBatch()
+    transactional.add(container, "1", "create", ({"id": "1"},))
+    with pytest.raises(CosmosNotSupportedError):
+        transactional.add(container, "2", "create", ({"id": "2"},))
+    with pytest.raises(CosmosNotSupportedError):
+        transactional.add(FakeContainer("other"), "1", "upsert", ({"id": "1"},))
+
+
+def test_batch_operation_limit():
+    container = FakeContainer("app_item")
+    transactional = batch.TransactionalBatch()
+    for i in range(batch.MAX_OPERATIONS):
+        transactional.add(container, "1", "upsert", ({"id": "1", "n": i},))
+    with pytest.raises(CosmosNotSupportedError):
+        transactional.add(container, "1", "upsert", ({"id": "1"},))
+
+
+def test_failed_batch_raises_database_error():
+    container = FakeContainer("app_item")
+    container.items["1"] = {"id": "1"}
+    transactional = batch.TransactionalBatch()
+    transactional.add(container, "1", "create", ({"id": "1"},))
+    with pytest.raises(CosmosDatabaseError):
+        transactional.commit()
+
+
+def test_atomic_commits_one_batch(db):
+    session = CosmosSession.objects.create(
+        session_key="a", session_data="one", expire_date=timezone.now()
+    )
+    with batch.atomic():
+        session.session_data = "two"
+        session.save()
+        session.session_data = "three"
+        session.save()
+        stored = list(sessions(db).items.values())
+        assert stored[0]["session_data"] == "one"
+    assert len(sessions(db).batches) == 1
+    assert list(sessions(db).items.values())[0]["session_data"] == "three"
+
+
+def test_atomic_discards_writes_on_error(db):
+    with pytest.raises(ValueError):
+        with batch.atomic():
+            new_session("a").save(force_insert=True)
+            raise ValueError
+    assert sessions(db).items == {}
+    assert sessions(db).batches == []
+
+
+def test_atomic_rejects_mixed_partitions(db):
+    with pytest.raises(CosmosNotSupportedError):
+        with batch.atomic():
+            new_session("a").save(force_insert=True)
+            new_session("b").save(force_insert=True)
+    assert sessions(db).items == {}
+
+
+def test_django_atomic_writes_immediately(db):
+    with transaction.atomic():
+        CosmosSession.objects.bulk_create([new_session(str(i)) for i in range(150)])
+        assert len(sessions(db).items) == 150
+    CosmosSession.objects.filter(session_key__in=["1", "2"]).delete()
+    assert len(sessions(db).items) == 148
+    assert sessions(db).batches == []
+
+
+def test_on_commit_runs_after_django_atomic(db):
+    calls = []
+    transaction.on_commit(lambda: calls.append("outside"))
+    assert calls == ["outside"]
+    with transaction.atomic():
+        transaction.on_commit(lambda: calls.append("inside"))
+        assert calls == ["outside"]
+    assert calls == ["outside", "inside"]
+
+
+def test_on_commit_discarded_when_django_atomic_raises(db):
+    calls = []
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            transaction.on_commit(lambda: calls.append("inside"))
+            raise ValueError
+    assert calls == []
+    transaction.on_commit(lambda: calls.append("after"))
+    assert calls == ["after"]
@@ -0,0 +1,113 @@
+from cosmos import batch, cache as query_cache
+from cosmos.cache import DjangoQueryCache, MemoryQueryCache
+from django.core.cache import cache as django_cache
+from django.db import connection
+from tests.models import Item
+
+import pytest
+
+
+@pytest.fixture(params=["memory", "django"])
+def backend(request):
+    django_cache.clear()
+    if request.param == "memory":
+        return MemoryQueryCache
+    return DjangoQueryCache
+
+
+@pytest.fixture
+def cached(db, backend):
+    connection.connection._cache = backend()
+    return db.containers["tests_item"]
+
+
+def names():
+    return sorted(item.name for item in Item.objects.all())
+
+
+def test_hit_and_miss(backend):
+    cache = backend()
+    assert cache.get("tests_item", "SELECT", []) is None
+    cache.set("tests_item", [{"id": "1"}], "SELECT", [])
+    assert cache.get("tests_item", "SELECT", []) == [{"id": "1"}]
+    assert cache.get("tests_item", "SELECT", [1]) is None
+    assert cache.get("other", "SELECT", []) is None
+
+
+def test_zero_timeout_disables_caching(backend):
+    cache = backend(timeout=0)
+    cache.set("tests_item", [], "SELECT")
+    assert cache.get("tests_item", "SELECT") is None
+
+
+def test_invalidate_is_per_container(backend):
+    cache = backend()
+    cache.set("tests_item", [], "SELECT")
+    cache.set("other", [], "SELECT")
+    cache.invalidate("tests_item")
+    assert cache.get("tests_item", "SELECT") is None
+    assert cache.get("other", "SELECT") == []
+
+
+def test_memory_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryQueryCache(timeout=10)
+    forever = MemoryQueryCache(timeout=None)
+    cache.set("tests_item", [], "SELECT")
+    forever.set("tests_item", [], "SELECT")
+    now[0] += 5
+    assert cache.get("tests_item", "SELECT") == []
+    now[0] += 10
+    assert cache.get("tests_item", "SELECT") is None
+    assert forever.get("tests_item", "SELECT") == []
+
+
+def test_memory_evicts_least_recently_used():
+    cache = MemoryQueryCache(max_entries=2)
+    cache.set("tests_item", 1, "a")
+    cache.set("tests_item", 2, "b")
+    cache.get("tests_item", "a")
+    cache.set("tests_item", 3, "c")
+    assert cache.get("tests_item", "a") == 1
+    assert cache.get("tests_item", "b") is None
+    assert cache.get("tests_item", "c") == 3
+
+
+def test_repeated_query_is_served_from_cache(cached):
+    Item.objects.create(name="a")
+    assert names() == ["a"]
+    queries = len(cached.queries)
+    assert names() == ["a"]
+    assert len(cached.queries) == queries
+
+
+def test_insert_invalidates(cached):
+    assert names() == []
+    Item.objects.create(name="a")
+    assert names() == ["a"]
+
+
+def test_update_invalidates(cached):
+    item = Item.objects.create(name="a")
+    assert names() == ["a"]
+    item.name = "b"
+    item.save()
+    assert names() == ["b"]
+
+
+def test_delete_invalidates(cached):
+    item = Item.objects.create(name="a")
+    assert names() == ["a"]
+    item.delete()
+    assert names() == []
+
+
+def test_batch_invalidates_on_commit(cached):
+    item = Item.objects.create(name="a")
+    assert names() == ["a"]
+    with batch.atomic():
+        item.name = "b"
+        item.save()
+        assert names() == ["a"]
+    assert names() == ["b"]
@@ -0,0 +1,116 @@
+from cosmos import changefeed
+from cosmos.changefeed import ChangeFeed, ContainerCheckpointStore, LocalCheckpointStore
+from django.db import connection
+from tests.models import Item
+
+import json
+import os
+import threading
+
+import pytest
+
+
+def create(*names):
+    for name in names:
+        Item.objects.create(name=name)
+
+
+def read(feed):
+    return [item.name for item in feed.read()]
+
+
+def test_persistent_checkpoints_start_from_beginning_and_resume(db, tmp_path):
+    store = LocalCheckpointStore(str(tmp_path / "feed.json"))
+    create("a", "b")
+    assert read(connection.change_feed(Item, checkpoints=store)) == ["a", "b"]
+    create("c")
+    assert read(connection.change_feed(Item, checkpoints=store)) == ["c"]
+    assert read(connection.change_feed(Item, checkpoints=store)) == []
+
+
+def test_memory_checkpoints_start_from_now(db):
+    create("a")
+    feed = connection.change_feed(Item)
+    assert read(feed) == []
+    create("b")
+    assert read(feed) == ["b"]
+
+
+def test_start_from_beginning_can_be_forced(db):
+    create("a")
+    feed = connection.change_feed(Item, start_from_beginning=True)
+    assert read(feed) == ["a"]
+
+
+def test_feeds_have_separate_checkpoints_by_name(db, tmp_path):
+    store = LocalCheckpointStore(str(tmp_path / "feed.json"))
+    create("a")
+    assert read(connection.change_feed(Item, checkpoints=store, name="one")) == ["a"]
+    assert read(connection.change_feed(Item, checkpoints=store, name="two")) == ["a"]
+
+
+def test_changes_become_model_instances(db):
+    create("a")
+    (item,) = connection.change_feed(Item, start_from_beginning=True).read()
+    assert isinstance(item, Item)
+    assert item.name == "a"
+    (row,) = connection.change_feed("tests_item", name="raw", start_from_beginning=True).read()
+    assert row["name"] == "a"
+
+
+def test_process_leases_each_feed_range(db, tmp_path):
+    db.containers["tests_item"].feed_range_count = 3
+    store = LocalCheckpointStore(str(tmp_path / "feed.json"))
+    create(*"abcdefghi")
+    seen, lock = [], threading.Lock()
+
+    def handler(items):
+        with lock:
+            seen.extend(item.name for item in items)
+
+    feed = connection.change_feed(Item, checkpoints=store, max_item_count=2)
+    assert feed.process(handler, max_workers=3) == 9
+    assert sorted(seen) == list("abcdefghi")
+    with open(store.path) as f:
+        leases = json.load(f)
+    assert sorted(leases) == sorted(feed.lease_id(r) for r in feed.feed_ranges())
+    assert len(leases) == 3
+
+    create("j")
+    assert feed.process(handler) == 1
+    assert seen[-1] == "j"
+
+
+def test_container_checkpoint_store(db):
+    store = ContainerCheckpointStore(connection.connection._db, "cosmos_leases")
+    assert store.get("lease") is None
+    store.set("lease", "token")
+    assert store.get("lease") == "token"
+    assert db.containers["cosmos_leases"].items["lease"]["continuation"] == "token"
+
+    create("a")
+    assert read(connection.change_feed(Item, checkpoints=store)) == ["a"]
+    create("b")
+    assert read(connection.change_feed(Item, checkpoints=store)) == ["b"]
+
+
+def test_local_checkpoints_reload_from_file(tmp_path):
+    path = str(tmp_path / "feed.json")
+    LocalCheckpointStore(path).set("lease", "token")
+    assert LocalCheckpointStore(path).get("lease") == "token"
+    assert os.listdir(str(tmp_path)) == ["feed.json"]
+
+
+def test_failed_checkpoint_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "feed.json")
+    store = LocalCheckpointStore(path)
+    store.set("lease", "one")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(changefeed.json, "dump", fail)
+    with pytest.raises(OSError):
+        store.set("lease", "two")
+    monkeypatch.undo()
+    assert LocalCheckpointStore(path).get("lease") == "one"
@@ -0,0 +1,34 @@
+from django.db.models import Q
+from tests.models import Item
+
+
+def items(db):
+    return db.containers["tests_item"].items
+
+
+def test_model_delete_removes_document(db):
+    item = Item.objects.create(name="a")
+    Item.objects.create(name="b")
+    item.delete()
+    assert [i["name"] for i in items(db).values()] == ["b"]
+
+
+def test_delete_with_exclude_and_or(db):
+    for name in "abcd":
+        Item.objects.create(name=name)
+    Item.objects.exclude(name="a").filter(Q(name="b") | Q(name="c")).delete()
+    assert sorted(i["name"] for i in items(db).values()) == ["a", "d"]
+    Item.objects.exclude(name="a").delete()
+    assert [i["name"] for i in items(db).values()] == ["a"]
+
+
+def test_delete_by_primary_keys(db):
+    created = [Item.objects.create(name=str(i)) for i in range(3)]
+    Item.objects.filter(pk__in=[created[0].pk, created[1].pk]).delete()
+    assert [i["name"] for i in items(db).values()] == ["2"]
+
+
+def test_update_by_primary_key(db):
+    item = Item.objects.create(name="a")
+    Item.objects.filter(pk=item.pk).update(number=3)
+    assert [i["number"] for i in items(db).values()] == [3]
@@ -0,0 +1,49 @@
+from cosmos import batch
+from cosmos.parallel import ParallelQuery
+from cosmos.sessions.models import CosmosSession
+from django.db import connection
+from django.utils import timezone
+from tests.fakes import CHARGE
+
+from datetime import timedelta
+
+
+def charges():
+    return connection.connection.request_charges
+
+
+def create(key):
+    return CosmosSession.objects.create(
+        session_key=key,
+        session_data="data",
+        expire_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_writes_and_reads_are_charged(db):
+    session = create("a")
+    assert charges().total("cosmos_session") == CHARGE
+    session.session_data = "changed"
+    session.save()  # key query, point read and upsert
+    assert charges().requests("cosmos_session") == 4
+    list(CosmosSession.objects.all())
+    assert charges().total("cosmos_session") == 5 * CHARGE
+
+
+def test_batch_is_charged(db):
+    session = create("a")
+    charges().reset()
+    with batch.atomic():
+        session.delete()
+    assert charges().requests("cosmos_session") == 2  # key query and batch
+
+
+def test_parallel_query_pages_are_charged(db):
+    container = db.containers["cosmos_session"]
+    container.feed_range_count = 3
+    for i in range(9):
+        create(str(i))
+    connection.connection._parallel = ParallelQuery()
+    charges().reset()
+    assert len(list(CosmosSession.objects.all())) == 9
+    assert charges().requests("cosmos_session") == 3
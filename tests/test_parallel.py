@@ -0,0 +1,84 @@
+from cosmos.parallel import ParallelQuery, sort_key, targets_one_partition
+from tests.fakes import FakeContainer
+
+import pytest
+
+
+@pytest.fixture
+def container():
+    container = FakeContainer("app_item", feed_range_count=4)
+    for i in range(40):
+        container.items[str(i)] = {
+            "id": str(i),
+            "number": None if i % 7 == 0 else i % 10,
+        }
+    return container
+
+
+def test_targets_one_partition():
+    assert targets_one_partition("SELECT t.a FROM t WHERE t.id = @arg0", "id")
+    assert not targets_one_partition("SELECT t.a FROM t WHERE t.number = @arg0", "id")
+
+
+def test_single_partition_query_is_not_split(container):
+    query = ParallelQuery()
+    sql = "SELECT app_item.id FROM app_item WHERE app_item.id = @arg0"
+    params = [{"name": "@arg0", "value": "3"}]
+    assert query.query_items(container, sql, params, "id") is None
+    assert container.queries == []
+
+
+def test_unsplittable_query_runs_serially(container):
+    query = ParallelQuery()
+    sql = "SELECT COUNT(1) FROM app_item"
+    assert query.query_items(container, sql, [], "id") is None
+
+
+def test_unordered_results_cover_every_range(container):
+    query = ParallelQuery(max_degree=2, max_buffered_item_count=5)
+    rows = list(query.query_items(container, "SELECT app_item.id FROM app_item", [], "id"))
+    assert sorted(r["id"] for r in rows) == sorted(container.items)
+    assert {q[2]["index"] for q in container.queries} == {0, 1, 2, 3}
+
+
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_ordered_merge_handles_nulls(container, direction):
+    query = ParallelQuery(max_degree=2, max_buffered_item_count=8)
+    sql = "SELECT app_item.id, app_item.number FROM app_item ORDER BY app_item.number {0}".format(
+        direction
+    )
+    rows = list(query.query_items(container, sql, [], "id"))
+    numbers = [sort_key(r["number"]) for r in rows]
+    assert len(rows) == 40
+    assert numbers == sorted(numbers, reverse=direction == "DESC")
+
+
+def test_ordered_merge_streams_pages(container):
+    query = ParallelQuery(max_degree=2, max_item_count=2)
+    sql = "SELECT app_item.id, app_item.number FROM app_item ORDER BY app_item.number"
+    result = query.query_items(container, sql, [], "id")
+    first = next(result)
+    assert first["number"] is None
+    result.close()
+
+
+def test_order_by_column_not_selected_runs_serially(container):
+    query = ParallelQuery()
+    sql = "SELECT app_item.id FROM app_item ORDER BY app_item.number"
+    assert query.query_items(container, sql, [], "id") is None
+    sql = "SELECT * FROM app_item ORDER BY app_item.number"
+    assert query.query_items(container, sql, [], "id") is not None
+
+
+def test_serial_queries_use_page_size(db):
+    from django.db import connection
+
+    container = db.containers["tests_item"]
+    container.feed_range_count = 4
+    for i in range(6):
+        container.items[str(i)] = {"id": str(i), "number": 5 - i}
+    connection.connection._parallel = ParallelQuery(max_item_count=2)
+    cursor = connection.connection.cursor("tests_item")
+    cursor.execute("SELECT tests_item.id FROM tests_item ORDER BY tests_item.number", [])
+    assert [row[0] for row in cursor.fetchmany(10)] == ["5", "4", "3", "2", "1", "0"]
+    assert container.queries[-1][2:] == (None, 2)
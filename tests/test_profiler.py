@@ -0,0 +1,108 @@
+from cosmos.profiler import (
+    INDEX_METRICS,
+    QUERY_METRICS,
+    QueryProfile,
+    parse_index_metrics,
+    parse_query_metrics,
+    profile_query,
+)
+from tests.fakes import CHARGE, FakeContainer
+
+from base64 import b64encode
+import json
+
+INDEXES = {
+    "UtilizedSingleIndexes": [{"FilterExpression": "", "IndexSpec": "/number/?"}],
+    "PotentialSingleIndexes": [],
+    "UtilizedCompositeIndexes": [],
+    "PotentialCompositeIndexes": [{"IndexSpecs": ["/number ASC", "/id ASC"]}],
+}
+
+
+def query_metrics(retrieved, output, ratio):
+    return (
+        "retrievedDocumentCount={0};outputDocumentCount={1};"
+        "indexUtilizationRatio={2};totalExecutionTimeInMs=1.50".format(
+            retrieved, output, ratio
+        )
+    )
+
+
+def profile(retrieved, output):
+    query = QueryProfile("app_item", "SELECT * FROM app_item", [], "id")
+    query.add_response({QUERY_METRICS: query_metrics(retrieved, output, 1.0)})
+    query.add_page(output)
+    return query
+
+
+def test_parse_query_metrics():
+    assert parse_query_metrics(query_metrics(10, 2, 0.5)) == {
+        "retrievedDocumentCount": 10.0,
+        "outputDocumentCount": 2.0,
+        "indexUtilizationRatio": 0.5,
+        "totalExecutionTimeInMs": 1.5,
+    }
+    assert parse_query_metrics(None) == {}
+
+
+def test_parse_index_metrics():
+    encoded = b64encode(json.dumps(INDEXES).encode("utf-8")).decode("ascii")
+    assert parse_index_metrics(encoded) == INDEXES
+    assert parse_index_metrics(json.dumps(INDEXES)) == INDEXES
+    assert parse_index_metrics("not json") == {}
+    assert parse_index_metrics(None) == {}
+
+
+def test_retrieved_warning_needs_ratio():
+    assert profile(15, 10).warnings == [
+        "Cross-partition query, filter on /id to target one partition"
+    ]
+    assert "Retrieved 500 documents to return 10" in profile(500, 10).warnings
+
+
+def test_profile_query_reads_every_page():
+    container = FakeContainer("app_item")
+    for i in range(3):
+        container.items[str(i)] = {"id": str(i), "number": i}
+    container.response_headers = {
+        QUERY_METRICS: query_metrics(3, 3, 0.75),
+        INDEX_METRICS: b64encode(json.dumps(INDEXES).encode("utf-8")).decode("ascii"),
+    }
+    result = profile_query(
+        container,
+        "SELECT app_item.id FROM app_item WHERE app_item.id = @arg0",
+        [{"name": "@arg0", "value": "1"}],
+        "id",
+    )
+    assert result.pages == 1
+    assert result.requests == 1
+    assert result.rows == 1
+    assert result.request_charge == CHARGE
+    assert result.index_utilization_ratio == 0.75
+    assert result.utilized_indexes == ["/number/?"]
+    assert result.warnings == ["Missing index: /number ASC, /id ASC"]
+    assert "Index utilization ratio: 0.75" in result.lines()
+
+
+def test_profile_adds_every_response_of_a_page():
+    container = FakeContainer("app_item", feed_range_count=3)
+    for i in range(4):
+        container.items[str(i)] = {"id": str(i), "number": i}
+    container.requests_per_page = 3
+    container.response_headers = {QUERY_METRICS: query_metrics(2, 1, 0.5)}
+    result = profile_query(container, "SELECT app_item.id FROM app_item", [], "id")
+    assert result.pages == 1
+    assert result.rows == 4
+    assert result.requests == 3
+    assert result.request_charge == 3 * CHARGE
+    assert result.metrics["retrievedDocumentCount"] == 6
+    assert "Request charge: 6.00 RU over 3 requests, 1 pages" in result.lines()
+    assert result.warnings[0].startswith("Cross-partition query fans out over 3")
+
+
+def test_single_feed_range_is_not_a_fan_out():
+    container = FakeContainer("app_item")
+    result = profile_query(container, "SELECT app_item.id FROM app_item", [], "id")
+    assert result.warnings == [
+        "Cross-partition query, filter on /id to target one partition"
+    ]
@@ -0,0 +1,58 @@
+from cosmos.options import default_ttl, document_ttl
+from cosmos.sessions.backend import SessionStore
+from cosmos.sessions.models import CosmosSession
+from django.utils import timezone
+
+from datetime import timedelta
+
+
+def documents(db):
+    return list(db.containers["cosmos_session"].items.values())
+
+
+def test_session_container_expires_documents(db):
+    assert db.containers["cosmos_session"].default_ttl == -1
+
+
+def test_ttl_field_defaults_container_ttl():
+    class Options:
+        cosmos_ttl_field = "expires"
+
+    assert default_ttl(Options) == -1
+    Options.cosmos_default_ttl = 3600
+    assert default_ttl(Options) == 3600
+    assert default_ttl(CosmosSession._meta) == -1
+
+
+def test_session_round_trip(db):
+    session = SessionStore()
+    session["user"] = "one"
+    session.create()
+    key = session.session_key
+    (document,) = documents(db)
+    assert document["session_key"] == key
+    assert 0 < document["ttl"] <= session.get_expiry_age()
+
+    loaded = SessionStore(key)
+    assert loaded["user"] == "one"
+    loaded["user"] = "two"
+    loaded.set_expiry(60)
+    loaded.save()
+
+    (document,) = documents(db)
+    assert document["ttl"] <= 60
+    assert SessionStore(key)["user"] == "two"
+
+
+def test_missing_session_starts_empty(db):
+    assert SessionStore("missing").load() == {}
+
+
+def test_document_ttl():
+    assert document_ttl(None) is None
+    assert document_ttl(-1) == -1
+    assert document_ttl(30) == 30
+    assert document_ttl(0) == 1
+    assert document_ttl(-5) == 1
+    assert document_ttl(timedelta(minutes=1)) == 60
+    assert document_ttl(timezone.now() - timedelta(seconds=1)) == 1
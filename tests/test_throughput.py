@@ -0,0 +1,74 @@
+from azure.cosmos import ThroughputProperties
+from cosmos.errors import CosmosNotSupportedError
+from cosmos.throughput import as_offer, scaled_throughput
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from tests.fakes import CHARGE
+from tests.models import Item
+
+from io import StringIO
+
+import pytest
+
+
+@pytest.fixture
+def container(db):
+    container = db.containers["tests_item"]
+    container.throughput = ThroughputProperties(offer_throughput=400)
+    return container
+
+
+def throughput(options):
+    output = StringIO()
+    call_command("cosmos_throughput", *options, stdout=output)
+    return output.getvalue().strip()
+
+
+def test_as_offer():
+    assert as_offer() is None
+    assert as_offer(400) == 400
+    assert as_offer(autoscale_max_throughput=4000).auto_scale_max_throughput == 4000
+    with pytest.raises(ValueError):
+        as_offer(400, 4000)
+
+
+def test_scaled_throughput_restores_on_exit(container):
+    with scaled_throughput(Item, throughput=10000) as scaled:
+        assert container.throughput.offer_throughput == 10000
+        Item.objects.create(name="a")
+    assert container.throughput.offer_throughput == 400
+    assert scaled.request_charge == CHARGE
+
+
+def test_scaled_throughput_restores_when_block_raises(container):
+    with pytest.raises(ValueError):
+        with scaled_throughput(Item, autoscale_max_throughput=4000):
+            assert container.throughput.auto_scale_max_throughput == 4000
+            raise ValueError
+    assert container.throughput.offer_throughput == 400
+    assert not container.throughput.auto_scale_max_throughput
+
+
+def test_shared_throughput_container_cannot_be_scaled(db):
+    with pytest.raises(CosmosNotSupportedError):
+        with scaled_throughput(Item, throughput=10000):
+            pass
+
+
+def test_command_shows_and_replaces_throughput(container):
+    assert throughput(["tests_item"]) == "tests_item: 400 RU/s"
+    assert throughput(["tests_item", "--throughput", "1000"]) == "tests_item: 1000 RU/s"
+    assert throughput(["tests_item", "--autoscale-max", "4000"]) == (
+        "tests_item: autoscale up to 4000 RU/s"
+    )
+
+
+def test_command_scales_around_run(container):
+    output = throughput(["tests_item", "--throughput", "10000", "--run", "check"])
+    assert "tests_item restored to 400 RU/s, 0.00 RU consumed" in output
+    assert container.throughput.offer_throughput == 400
+
+
+def test_command_rejects_shared_throughput_container(db):
+    with pytest.raises(CommandError, match="shared throughput"):
+        throughput(["tests_item"])